@@ -1,47 +1,101 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Optional, Tuple
+import json
 import re
 
 from docx import Document
 
-from agent.llm.gemini_client import GeminiClient
-from agent.rag.ingest import query_improved
+from agent.doc_processing.parser import get_paragraph_texts, join_truncated
+from agent.llm.gemini_client import get_gemini_client
+from agent.rag.cache import cached_query_improved
+from agent.rag.dedupe import dedupe_passages, truncate_passage_text
 from agent.reporting.report import Issue
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
+
+# Linear-time engine for parsing untrusted model output, when available
+try:
+    import re2 as _re_linear  # type: ignore
+except Exception:
+    _re_linear = re  # type: ignore
+
+
+# Matches: "1.", "1)", "1 -", "1 –", "1:"
+_NUM_PARA_RE = re.compile(r"^\s*\d+\s*(\.|\)|-|–|:)\s+")
+
+# Gemini may wrap its JSON answer in a markdown code block. Inline (?s) instead of
+# re.DOTALL so the pattern compiles the same under re2 and re.
+_JSON_BLOCK_RE = _re_linear.compile(r"(?s)```(?:json)?\s*(\[.*?\])\s*```")
+
+# Employment Contract key terms presence checks: (pattern, issue, suggestion).
+# Separate precompiled searches beat one fused alternation here: each keeps re's
+# literal-prefix fast path and stops at its first match.
+_EMPLOYMENT_CHECKS: Tuple[Tuple[re.Pattern, str, str], ...] = tuple(
+    (re.compile(p), m, s) for p, m, s in [
+        (r"hours\s+of\s+work|working\s+hours|normal\s+working\s+hours", "Hours of work not specified.", "Include normal working hours, rest periods, and any overtime provisions."),
+        (r"place\s+of\s+employment|place\s+of\s+work|work\s+location", "Place of employment not specified.", "State the usual place of employment or arrangements for remote/hybrid work."),
+        (r"remuneration|salary|wage", "Remuneration/salary not specified.", "State base salary/remuneration and any allowances or bonuses."),
+        (r"annual\s+leave|vacation|holiday\s+entitlement", "Annual leave entitlement not specified.", "Specify annual leave entitlement and accrual rules."),
+        (r"notice\s+period|notice\s+of\s+termination|termination\s+notice", "Notice period not specified.", "Specify notice periods for termination by employer and employee."),
+        (r"probation", "Probation period not specified.", "If applicable, state probation duration and conditions."),
+    ]
+)
+
+
+# RAG query tailored to the doc type: (query, scopes)
+_RAG_QUERIES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "Employment Contract": (
+        "ADGM Employment Regulations 2024 mandatory employment contract terms and governing law clause",
+        ("Employment Contracts",),
+    ),
+    "Articles of Association": (
+        "ADGM Companies Regulations 2020 Articles of Association must be in a single document and paragraphs numbered consecutively",
+        ("AoA", "Company Incorporation"),
+    ),
+    "_default": (
+        "ADGM model jurisdiction clause governed by ADGM law and ADGM Courts",
+        ("Jurisdiction/Choice-of-Law",),
+    ),
+}
+
+_ISSUES_SYSTEM_PROMPT = (
+    "You are an ADGM legal compliance checker. Using the retrieved ADGM sources, "
+    "identify concrete red flags in the document. Cite the exact ADGM rule in parentheses.\n"
+    "Respond in JSON array of objects with keys: section (optional), issue, severity (High/Medium/Low), suggestion."
+)
+
 
 def _summarize_doc(doc: Document, max_chars: int = 12000) -> str:
-    text = "\n".join(p.text for p in doc.paragraphs)
-    return text[:max_chars]
+    return join_truncated(get_paragraph_texts(doc), max_chars)
 
 
 def _ask_gemini_for_issues(document_text: str, retrieved_passages: List[Dict[str, str]], doc_type: str) -> List[Issue]:
-    gemini = GeminiClient()
+    gemini = get_gemini_client()
     if not gemini.enabled or not getattr(gemini, "model", None):
         return []
 
     refs_str = "\n\n".join([
-        f"[Source: {r.get('title','')}; {r.get('citation','')}]\n{r['text']}" for r in retrieved_passages
+        f"[Source: {r.get('title','')}; {r.get('citation','')}]\n{truncate_passage_text(r['text'])}" for r in retrieved_passages
     ])
 
+    # Static instructions live in the system instruction; only per-document content is sent
     prompt = (
-        "You are an ADGM legal compliance checker. Using the retrieved ADGM sources, "
-        "identify concrete red flags in the document. Cite the exact ADGM rule in parentheses.\n\n"
-        f"Document type: {doc_type}\n\n"
-        "Document (excerpt):\n" + document_text + "\n\n"
         "Retrieved ADGM references:\n" + refs_str + "\n\n"
-        "Respond in JSON array of objects with keys: section (optional), issue, severity (High/Medium/Low), suggestion."
+        f"Document type: {doc_type}\n\n"
+        "Document (excerpt):\n" + document_text
     )
 
     try:
-        resp = gemini.model.generate_content(prompt)
-        text = getattr(resp, "text", "").strip()
+        text = gemini.generate_with_instruction(_ISSUES_SYSTEM_PROMPT, prompt)
         # Gemini may return markdown code block; try to extract JSON
-        import json, re
-        match = re.search(r"```(?:json)?\s*(\[.*?\])\s*```", text, re.DOTALL)
+        match = _JSON_BLOCK_RE.search(text)
         if match:
             text = match.group(1)
-        data = json.loads(text)
+        data = orjson.loads(text) if orjson is not None else json.loads(text)
         issues: List[Issue] = []
         for item in data if isinstance(data, list) else []:
             issues.append(
@@ -59,14 +113,13 @@ def _ask_gemini_for_issues(document_text: str, retrieved_passages: List[Dict[str
 
 
 def _paragraph_starts_with_number(text: str) -> bool:
-    # Matches: "1.", "1)", "1 -", "1 –", "1:"
-    return re.match(r"^\s*\d+\s*(\.|\)|-|–|:)\s+", text) is not None
+    return _NUM_PARA_RE.match(text) is not None
 
 
 def _has_sequential_numbered_paragraphs(doc: Document, min_count: int = 3) -> bool:
     count = 0
-    for p in doc.paragraphs:
-        t = p.text.strip()
+    for text in get_paragraph_texts(doc):
+        t = text.strip()
         if not t:
             continue
         if _paragraph_starts_with_number(t):
@@ -76,40 +129,27 @@ def _has_sequential_numbered_paragraphs(doc: Document, min_count: int = 3) -> bo
     return False
 
 
-def analyze_document(doc: Document, filename: str, doc_type: str) -> List[Issue]:
-    issues: List[Issue] = []
-
-    # Build RAG query tailored to the doc type
-    if doc_type == "Employment Contract":
-        query = "ADGM Employment Regulations 2024 mandatory employment contract terms and governing law clause"
-        scopes = ["Employment Contracts"]
-    elif doc_type == "Articles of Association":
-        query = "ADGM Companies Regulations 2020 Articles of Association must be in a single document and paragraphs numbered consecutively"
-        scopes = ["AoA", "Company Incorporation"]
-    else:
-        query = "ADGM model jurisdiction clause governed by ADGM law and ADGM Courts"
-        scopes = ["Jurisdiction/Choice-of-Law"]
+def _retrieve_references(doc_type: str) -> List[Dict[str, str]]:
+    query, scopes = _RAG_QUERIES.get(doc_type, _RAG_QUERIES["_default"])
 
     retrieved = []
     try:
-        retrieved = query_improved(query_text=query, top_k=5, pre_k=30, filter_scopes=scopes)
+        retrieved = cached_query_improved(query_text=query, top_k=5, pre_k=30, filter_scopes=list(scopes))
     except Exception:
         pass
+    return dedupe_passages(retrieved)
 
-    doc_text = _summarize_doc(doc)
 
-    # Ask Gemini for issues using RAG context (if available)
-    llm_issues = _ask_gemini_for_issues(doc_text, retrieved, doc_type)
-    for i in llm_issues:
-        i.document = filename
-    issues.extend(llm_issues)
+def _rule_based_issues(doc: Document, filename: str, doc_type: str, doc_text: str) -> List[Issue]:
+    issues: List[Issue] = []
 
     # Rule-based fallbacks — expand coverage so issues are raised even if LLM/RAG are empty
     lower = doc_text.lower()
+    has_adgm = "abu dhabi global market" in lower or "adgm" in lower
 
     if doc_type == "Employment Contract":
         # Governing law must reference ADGM
-        if "abu dhabi global market" not in lower and "adgm" not in lower:
+        if not has_adgm:
             issues.append(Issue(
                 document=filename,
                 section=None,
@@ -118,16 +158,8 @@ def analyze_document(doc: Document, filename: str, doc_type: str) -> List[Issue]
                 suggestion="Add: 'This employment contract is governed by the laws of the Abu Dhabi Global Market (ADGM).'",
             ))
         # Key terms presence checks
-        checks = [
-            (r"hours\s+of\s+work|working\s+hours|normal\s+working\s+hours", "Hours of work not specified.", "Include normal working hours, rest periods, and any overtime provisions."),
-            (r"place\s+of\s+employment|place\s+of\s+work|work\s+location", "Place of employment not specified.", "State the usual place of employment or arrangements for remote/hybrid work."),
-            (r"remuneration|salary|wage", "Remuneration/salary not specified.", "State base salary/remuneration and any allowances or bonuses."),
-            (r"annual\s+leave|vacation|holiday\s+entitlement", "Annual leave entitlement not specified.", "Specify annual leave entitlement and accrual rules."),
-            (r"notice\s+period|notice\s+of\s+termination|termination\s+notice", "Notice period not specified.", "Specify notice periods for termination by employer and employee."),
-            (r"probation", "Probation period not specified.", "If applicable, state probation duration and conditions."),
-        ]
-        for pattern, msg, suggestion in checks:
-            if re.search(pattern, lower) is None:
+        for pattern, msg, suggestion in _EMPLOYMENT_CHECKS:
+            if pattern.search(lower) is None:
                 issues.append(Issue(
                     document=filename,
                     section=None,
@@ -149,8 +181,7 @@ def analyze_document(doc: Document, filename: str, doc_type: str) -> List[Issue]
 
     # Generic jurisdiction clause check for other contracts
     if doc_type not in ("Employment Contract", "Articles of Association"):
-        jurisdiction_present = ("abu dhabi global market" in lower or "adgm" in lower)
-        if not jurisdiction_present:
+        if not has_adgm:
             issues.append(Issue(
                 document=filename,
                 section=None,
@@ -160,3 +191,19 @@ def analyze_document(doc: Document, filename: str, doc_type: str) -> List[Issue]
             ))
 
     return issues
+
+
+def analyze_document(doc: Document, filename: str, doc_type: str) -> List[Issue]:
+    issues: List[Issue] = []
+
+    retrieved = _retrieve_references(doc_type)
+    doc_text = _summarize_doc(doc)
+
+    # Ask Gemini for issues using RAG context (if available)
+    llm_issues = _ask_gemini_for_issues(doc_text, retrieved, doc_type)
+    for i in llm_issues:
+        i.document = filename
+    issues.extend(llm_issues)
+
+    issues.extend(_rule_based_issues(doc, filename, doc_type, doc_text))
+    return issues
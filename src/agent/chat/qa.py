@@ -2,8 +2,19 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional
 
-from agent.llm.gemini_client import GeminiClient
-from agent.rag.ingest import query_improved
+from agent.chat.semantic_cache import QA_SEMANTIC_CACHE, context_key
+from agent.config import CONFIG
+from agent.llm.gemini_client import get_gemini_client
+from agent.rag.cache import cached_query_improved
+from agent.rag.dedupe import dedupe_passages, truncate_passage_text
+
+
+_QA_SYSTEM_PROMPT = (
+    "You are an ADGM legal compliance assistant. Answer using the provided ADGM references and context.\n"
+    "- If you reference a rule, cite it inline with (Title/Year or clear source).\n"
+    "- If document context is incomplete, explain the missing detail and what the regulation requires.\n"
+    "- Be specific and concise."
+)
 
 
 def answer_question(
@@ -13,6 +24,15 @@ def answer_question(
     doc_context: Optional[str] = None,
     issues: Optional[List[Dict[str, str]]] = None,
 ) -> Dict[str, object]:
+    use_cache = CONFIG.qa_semantic_cache
+    ctx = ""
+    question_vec = None
+    if use_cache:
+        ctx = context_key(tuple(scopes or ()), top_k, doc_context, issues)
+        cached, question_vec = QA_SEMANTIC_CACHE.lookup(ctx, question)
+        if cached is not None:
+            return cached
+
     # Heuristic: if question mentions hours/working time, prefer Employment Regs 2024
     filter_source_ids = None
     qlower = question.lower()
@@ -23,7 +43,7 @@ def answer_question(
 
     passages = []
     try:
-        passages = query_improved(
+        passages = cached_query_improved(
             query_text=question,
             top_k=top_k,
             pre_k=50,
@@ -33,8 +53,9 @@ def answer_question(
         )
     except Exception:
         passages = []
+    passages = dedupe_passages(passages)
 
-    gemini = GeminiClient()
+    gemini = get_gemini_client()
     context_blocks: List[str] = []
 
     if doc_context:
@@ -53,30 +74,27 @@ def answer_question(
         context_blocks.append(
             "ADGM references:\n" +
             "\n\n".join([
-                f"[Source: {p.get('title','')} — {p.get('citation','')}]\n{p['text']}" for p in passages
+                f"[Source: {p.get('title','')} — {p.get('citation','')}]\n{truncate_passage_text(p['text'])}" for p in passages
             ])
         )
 
     full_context = "\n\n".join(context_blocks) if context_blocks else "(no additional context)"
 
+    # Static instructions live in the system instruction; only context + question are sent
     prompt = (
-        "You are an ADGM legal compliance assistant. Answer using the provided ADGM references and context.\n"
-        "- If you reference a rule, cite it inline with (Title/Year or clear source).\n"
-        "- If document context is incomplete, explain the missing detail and what the regulation requires.\n"
-        "- Be specific and concise.\n\n"
-        f"Question: {question}\n\n"
         f"Context:\n{full_context}\n\n"
+        f"Question: {question}\n\n"
         "Answer:"
     )
 
     answer = ""
     if gemini.enabled and getattr(gemini, "model", None):
         try:
-            resp = gemini.model.generate_content(prompt)
-            answer = getattr(resp, "text", "").strip()
+            answer = gemini.generate_with_instruction(_QA_SYSTEM_PROMPT, prompt)
         except Exception:
             answer = ""
 
+    generated = bool(answer)
     if not answer:
         # Deterministic fallback with explicit citation
         answer = (
@@ -84,8 +102,12 @@ def answer_question(
             "including normal hours, rest periods, and applicable overtime provisions where relevant (ADGM Employment Regulations 2024)."
         )
 
-    return {
+    response: Dict[str, object] = {
         "answer": answer,
         "citations": [{"title": p.get("title", ""), "citation": p.get("citation", "")} for p in passages],
         "passages": passages,
     }
+    # Only cache real model answers, never the deterministic fallback
+    if use_cache and generated:
+        QA_SEMANTIC_CACHE.add(ctx, question, response, vector=question_vec)
+    return response
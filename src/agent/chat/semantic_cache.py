@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent.rag.ingest import IngestConfig, get_embedder
+
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # type: ignore
+
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _normalize(question: str) -> str:
+    return _WS_RE.sub(" ", (question or "").strip().lower())
+
+
+def context_key(*parts: Any) -> str:
+    # Answers also depend on scopes/doc context/issues, so only questions asked
+    # under the same context are allowed to match each other.
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache for Q&A responses: a near-duplicate question
+    (cosine >= threshold) under the same context returns the stored response.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1024, embedding_model: Optional[str] = None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.embedding_model = embedding_model or IngestConfig.embedding_model
+        # Embedding failures (e.g. sentence-transformers missing) are treated as misses
+        self.enabled = np is not None
+        self._lock = threading.Lock()
+        self._vectors = None  # (N, d) unit-normalized question embeddings
+        self._contexts: List[str] = []
+        self._responses: List[Dict[str, Any]] = []
+        self._last_used: List[int] = []
+        self._tick = 0
+
+    def _embed(self, question: str):
+        vec = get_embedder(self.embedding_model).encode([_normalize(question)], normalize_embeddings=True, convert_to_numpy=True)[0]
+        return vec.astype(np.float32)
+
+    def lookup(self, ctx: str, question: str) -> Tuple[Optional[Dict[str, Any]], Any]:
+        """
+        Returns (cached response or None, question embedding). Pass the embedding to
+        add() on a miss so the question is only encoded once.
+        """
+        if not self.enabled:
+            return None, None
+        try:
+            q = self._embed(question)
+        except Exception:
+            return None, None
+        with self._lock:
+            if self._vectors is None or not self._responses:
+                return None, q
+            scores = self._vectors @ q
+            for i, c in enumerate(self._contexts):
+                if c != ctx:
+                    scores[i] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None, q
+            self._tick += 1
+            self._last_used[best] = self._tick
+            return copy.deepcopy(self._responses[best]), q
+
+    def add(self, ctx: str, question: str, response: Dict[str, Any], vector: Any = None) -> None:
+        if not self.enabled:
+            return
+        q = vector
+        if q is None:
+            try:
+                q = self._embed(question)
+            except Exception:
+                return
+        with self._lock:
+            if self._vectors is not None and len(self._responses) >= self.max_entries:
+                # Evict the least recently used entry
+                victim = min(range(len(self._last_used)), key=self._last_used.__getitem__)
+                self._vectors = np.delete(self._vectors, victim, axis=0)
+                del self._contexts[victim]
+                del self._responses[victim]
+                del self._last_used[victim]
+            row = q[None, :]
+            self._vectors = row if self._vectors is None else np.vstack([self._vectors, row])
+            self._contexts.append(ctx)
+            self._responses.append(copy.deepcopy(response))
+            self._tick += 1
+            self._last_used.append(self._tick)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors = None
+            self._contexts = []
+            self._responses = []
+            self._last_used = []
+
+
+# Lives here rather than in qa.py, which the UI hot-reloads on every question
+QA_SEMANTIC_CACHE = SemanticCache(threshold=0.95, max_entries=1024)
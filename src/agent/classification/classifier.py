@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import re
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from docx import Document
 
-from agent.llm.gemini_client import GeminiClient
+from agent.doc_processing.parser import get_paragraph_texts, join_truncated
+from agent.llm.gemini_client import get_gemini_client
 
 
 KNOWN_LABELS: List[str] = [
@@ -22,47 +23,49 @@ KNOWN_LABELS: List[str] = [
 ]
 
 
+# Filename rules, first match wins: (all of these substrings, at least one of these or (), label)
+_FILENAME_RULES: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...], str], ...] = (
+    (("articles", "association"), (), "Articles of Association"),
+    (("employment", "contract"), (), "Employment Contract"),
+    (("register", "members"), (), "Register of Members"),
+    (("register", "directors"), (), "Register of Directors"),
+    # Could be shareholder or board resolution
+    (("resolution",), ("incorporation", "amendment", "articles"), "Shareholder Resolution"),
+    (("application",), ("incorporation", "registration"), "Incorporation Application Form"),
+    (("appropriate_policy",), (), "Appropriate Policy Document"),
+    (("data_protection", "policy"), (), "Data Protection Policy"),
+)
+
+# Content rules, first match wins. Shareholder/board resolutions default to Shareholder Resolution.
+_CONTENT_RULES: Tuple[Tuple[re.Pattern, str], ...] = tuple(
+    (re.compile(pattern), label) for pattern, label in [
+        (r"articles of association", "Articles of Association"),
+        (r"employment\s+contract|employed\s+by", "Employment Contract"),
+        (r"register\s+of\s+members", "Register of Members"),
+        (r"register\s+of\s+directors", "Register of Directors"),
+        (r"(shareholder|board)\s+resolution", "Shareholder Resolution"),
+        (r"application\s+for\s+(incorporation|registration)", "Incorporation Application Form"),
+    ]
+)
+
+
 class DocumentClassifier:
     def __init__(self):
-        self.gemini = GeminiClient()
+        self.gemini = get_gemini_client()
 
     def classify(self, filename: str, doc: Document) -> str:
         # Rule-based quick checks by filename
         lower_name = filename.lower()
-        if "articles" in lower_name and "association" in lower_name:
-            return "Articles of Association"
-        if "employment" in lower_name and "contract" in lower_name:
-            return "Employment Contract"
-        if "register" in lower_name and "members" in lower_name:
-            return "Register of Members"
-        if "register" in lower_name and "directors" in lower_name:
-            return "Register of Directors"
-        if "resolution" in lower_name and ("incorporation" in lower_name or "amendment" in lower_name or "articles" in lower_name):
-            # Could be shareholder or board resolution
-            return "Shareholder Resolution"
-        if "application" in lower_name and ("incorporation" in lower_name or "registration" in lower_name):
-            return "Incorporation Application Form"
-        if "appropriate_policy" in lower_name:
-            return "Appropriate Policy Document"
-        if "data_protection" in lower_name and "policy" in lower_name:
-            return "Data Protection Policy"
+        for required, any_of, label in _FILENAME_RULES:
+            if all(k in lower_name for k in required) and (not any_of or any(k in lower_name for k in any_of)):
+                return label
 
         # Content-based heuristics
-        full_text = "\n".join(p.text for p in doc.paragraphs[:150])[:8000]
+        full_text = join_truncated(get_paragraph_texts(doc)[:150], 8000)
         text_lower = full_text.lower()
-        if re.search(r"articles of association", text_lower):
-            return "Articles of Association"
-        if re.search(r"employment\s+contract|employed\s+by", text_lower):
-            return "Employment Contract"
-        if re.search(r"register\s+of\s+members", text_lower):
-            return "Register of Members"
-        if re.search(r"register\s+of\s+directors", text_lower):
-            return "Register of Directors"
-        if re.search(r"(shareholder|board)\s+resolution", text_lower):
-            # default to Shareholder Resolution
-            return "Shareholder Resolution"
-        if re.search(r"application\s+for\s+(incorporation|registration)", text_lower):
-            return "Incorporation Application Form"
+        for pattern, label in _CONTENT_RULES:
+            if pattern.search(text_lower):
+                return label
 
         # Optional Gemini assist
         gemini_label: Optional[str] = self.gemini.classify(full_text, KNOWN_LABELS)
@@ -1,22 +1,68 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import threading
+from functools import cached_property
 from dotenv import load_dotenv
 
 
-load_dotenv()
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def _ensure_env_loaded() -> None:
+    # .env is read on first config access rather than at import time
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            load_dotenv()
+            _env_loaded = True
+
+
+def _getenv(name: str, default: str | None = None) -> str | None:
+    _ensure_env_loaded()
+    return os.getenv(name, default)
 
 
-@dataclass(frozen=True)
 class AppConfig:
-    app_env: str = os.getenv("APP_ENV", "local")
-    llm_provider: str = os.getenv("LLM_PROVIDER", "ollama")
-    gemini_api_key: str | None = os.getenv("GEMINI_API_KEY")
-    ollama_host: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+    """
+    Application settings from the environment (and .env). Each value is read on
+    first access and then fixed for the lifetime of the instance.
+    """
+
+    @cached_property
+    def app_env(self) -> str:
+        return _getenv("APP_ENV", "local")
+
+    @cached_property
+    def llm_provider(self) -> str:
+        return _getenv("LLM_PROVIDER", "ollama")
+
+    @cached_property
+    def gemini_api_key(self) -> str | None:
+        return _getenv("GEMINI_API_KEY")
+
+    @cached_property
+    def ollama_host(self) -> str:
+        return _getenv("OLLAMA_HOST", "http://localhost:11434")
+
+    @cached_property
+    def comment_author(self) -> str:
+        return _getenv("COMMENT_AUTHOR", "ADGM Corporate Agent")
+
+    @cached_property
+    def comment_initials(self) -> str:
+        return _getenv("COMMENT_INITIALS", "AA")
+
+    @cached_property
+    def qa_semantic_cache(self) -> bool:
+        return _getenv("QA_SEMANTIC_CACHE", "false").lower() in ("1", "true", "yes")
 
-    comment_author: str = os.getenv("COMMENT_AUTHOR", "ADGM Corporate Agent")
-    comment_initials: str = os.getenv("COMMENT_INITIALS", "AA")
+    @cached_property
+    def chroma_persist_dir(self) -> str | None:
+        return _getenv("CHROMA_PERSIST_DIR") or None
 
 
 CONFIG = AppConfig()
@@ -1,40 +1,53 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from docx import Document
 from docx.shared import RGBColor
 
+from agent.doc_processing.parser import get_paragraph_texts, invalidate_paragraph_texts
 
-def _find_paragraph_index(document: Document, needle: str) -> Optional[int]:
-    if not needle:
-        return None
-    target = needle.strip().lower()
-    for idx, p in enumerate(document.paragraphs):
-        if target in (p.text or "").lower():
-            return idx
-    return None
+
+def _normalize_needle(needle: Optional[str]) -> str:
+    return (needle or "").strip().lower()
+
+
+def _build_anchor_index(para_lower: List[str], needles: Iterable[str]) -> Dict[str, int]:
+    """
+    Maps each normalized needle to the first paragraph containing it, in a single
+    pass over the (already lowercased) paragraphs. Needles drop out once found.
+    """
+    pending = {n for n in needles if n}
+    index: Dict[str, int] = {}
+    for idx, text in enumerate(para_lower):
+        if not pending:
+            break
+        found = [n for n in pending if n in text]
+        for n in found:
+            index[n] = idx
+        pending.difference_update(found)
+    return index
+
+
+# (trigger words in the issue text, anchor keywords to try), in priority order
+_KEYWORD_RULES: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...] = (
+    (("jurisdiction", "govern", "adgm"), ("jurisdiction", "governed", "adgm", "law of the abu dhabi global market")),
+    (("article", "paragraph", "number"), ("article", "paragraph", "number", "articles of association")),
+    (("employment", "contract"), ("employment contract", "employee", "employer")),
+    (("register", "members", "directors"), ("register of members", "register of directors", "register")),
+)
+_DEFAULT_KEYWORDS: Tuple[str, ...] = ("abu dhabi global market", "adgm courts")
 
 
 def _heuristic_keywords(issue_text: str) -> List[str]:
     text = (issue_text or "").lower()
     keywords: List[str] = []
-    if any(k in text for k in ["jurisdiction", "govern", "adgm"]):
-        keywords.extend(["jurisdiction", "governed", "adgm", "law of the abu dhabi global market"])
-    if any(k in text for k in ["article", "paragraph", "number"]):
-        keywords.extend(["article", "paragraph", "number", "articles of association"])
-    if any(k in text for k in ["employment", "contract"]):
-        keywords.extend(["employment contract", "employee", "employer"])
-    if any(k in text for k in ["register", "members", "directors"]):
-        keywords.extend(["register of members", "register of directors", "register"])
-    keywords.extend(["abu dhabi global market", "adgm courts"])
-    seen = set()
-    uniq: List[str] = []
-    for k in keywords:
-        if k not in seen:
-            uniq.append(k)
-            seen.add(k)
-    return uniq
+    for triggers, rule_keywords in _KEYWORD_RULES:
+        if any(k in text for k in triggers):
+            keywords.extend(rule_keywords)
+    keywords.extend(_DEFAULT_KEYWORDS)
+    # dict preserves first-seen order
+    return list(dict.fromkeys(keywords))
 
 
 def _build_comment_text(issue: Dict[str, Any]) -> str:
@@ -78,25 +91,34 @@ def add_issue_comments(
     initials: str,
     add_inline_marker: bool = True,
 ) -> Document:
-    paragraph_adds = hasattr(document.paragraphs[0].__class__, "add_comment") if document.paragraphs else False
-
+    paragraphs = document.paragraphs
+    paragraph_adds = hasattr(paragraphs[0].__class__, "add_comment") if paragraphs else False
+    # Anchor candidates per issue: its section (if any) first, then heuristic keywords
+    candidates: List[List[str]] = []
     for issue in issues:
-        if not document.paragraphs:
+        section = issue.get("section")
+        cands = [_normalize_needle(section)] if isinstance(section, str) and section.strip() else []
+        cands.extend(_heuristic_keywords(issue.get("issue") or ""))
+        candidates.append(cands)
+
+    # Resolve every candidate in one pass over the original text (not text added
+    # by earlier comments), lowercased once
+    para_lower = [(t or "").lower() for t in get_paragraph_texts(document)]
+    anchor_index = _build_anchor_index(para_lower, (n for cands in candidates for n in cands))
+
+    for issue, cands in zip(issues, candidates):
+        if not paragraphs:
             break
         anchor_idx: Optional[int] = None
-        section = issue.get("section")
-        if isinstance(section, str) and section.strip():
-            anchor_idx = _find_paragraph_index(document, section)
-        if anchor_idx is None:
-            for kw in _heuristic_keywords(issue.get("issue") or ""):
-                anchor_idx = _find_paragraph_index(document, kw)
-                if anchor_idx is not None:
-                    break
+        for needle in cands:
+            anchor_idx = anchor_index.get(needle)
+            if anchor_idx is not None:
+                break
         if anchor_idx is None:
             anchor_idx = 0
 
         comment_text = _build_comment_text(issue)
-        paragraph = document.paragraphs[anchor_idx]
+        paragraph = paragraphs[anchor_idx]
         try:
             if paragraph_adds:
                 paragraph.add_comment(comment_text, author=author, initials=initials)
@@ -109,6 +131,8 @@ def add_issue_comments(
         if add_inline_marker:
             _add_inline_marker(paragraph, issue.get("issue") or "Issue")
 
+    if issues and paragraphs:
+        invalidate_paragraph_texts(document)
     return document
 
 
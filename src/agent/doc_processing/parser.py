@@ -1,25 +1,86 @@
 from __future__ import annotations
 
+import re
+import zipfile
 from io import BytesIO
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from docx import Document
 
+try:
+    from lxml.etree import iterparse  # type: ignore
+except Exception:
+    from xml.etree.ElementTree import iterparse  # type: ignore
+
 
 def load_document_from_bytes(data: bytes) -> Document:
     buffer = BytesIO(data)
     return Document(buffer)
 
 
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W_NS + "p"
+_W_T = _W_NS + "t"
+_W_TAB = _W_NS + "tab"
+_W_BR = _W_NS + "br"
+_W_CR = _W_NS + "cr"
+_W_HYPHEN = _W_NS + "noBreakHyphen"
+_W_TYPE = _W_NS + "type"
+# Property subtrees hold tab-stop definitions etc., not text
+_W_PROPS = (_W_NS + "pPr", _W_NS + "rPr")
+# Alternate (VML) rendering of content such as text boxes, duplicating the mc:Choice text
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# Common Word heading styles: "Heading 1", "Heading 2", etc.
+_HEADING_RE = re.compile(r"^heading\S*\s+(\d+)\s*$", re.IGNORECASE)
+
+_PARA_TEXTS_ATTR = "_agent_paragraph_texts"
+
+
+def get_paragraph_texts(doc: Document) -> List[str]:
+    """
+    Returns the text of every paragraph, extracted once per document.
+    `paragraph.text` re-walks the run XML on each access, so callers that scan
+    the same document share this snapshot instead. Call
+    invalidate_paragraph_texts() after mutating the document.
+    """
+    texts = getattr(doc, _PARA_TEXTS_ATTR, None)
+    if texts is None:
+        texts = [p.text for p in doc.paragraphs]
+        try:
+            setattr(doc, _PARA_TEXTS_ATTR, texts)
+        except AttributeError:
+            pass
+    return texts
+
+
+def invalidate_paragraph_texts(doc: Document) -> None:
+    try:
+        delattr(doc, _PARA_TEXTS_ATTR)
+    except AttributeError:
+        pass
+
+
+def join_truncated(texts: Iterable[str], max_chars: int) -> str:
+    """
+    Same result as "\n".join(texts)[:max_chars], but stops collecting as soon as
+    max_chars is covered instead of materializing the whole document text.
+    """
+    buf: List[str] = []
+    total = 0
+    for t in texts:
+        buf.append(t)
+        total += len(t) + 1
+        if total > max_chars:
+            break
+    return "\n".join(buf)[:max_chars]
+
+
 def detect_heading_level(style_name: Optional[str]) -> Optional[int]:
     if not style_name:
         return None
-    # Common Word heading styles: "Heading 1", "Heading 2", etc.
-    if style_name.lower().startswith("heading"):
-        parts = style_name.split()
-        if len(parts) == 2 and parts[1].isdigit():
-            return int(parts[1])
-    return None
+    match = _HEADING_RE.match(style_name)
+    return int(match.group(1)) if match else None
 
 
 def parse_document_structure(doc: Document) -> List[Dict[str, Any]]:
@@ -29,13 +90,18 @@ def parse_document_structure(doc: Document) -> List[Dict[str, Any]]:
     - paragraph: {type: "paragraph", text: str}
     """
     blocks: List[Dict[str, Any]] = []
-    for paragraph in doc.paragraphs:
-        text = paragraph.text.strip()
+    # Most paragraphs share a handful of styles; resolve each name's level once
+    style_cache: Dict[Optional[str], Optional[int]] = {}
+    for paragraph, raw_text in zip(doc.paragraphs, get_paragraph_texts(doc)):
+        text = raw_text.strip()
         if not text:
             continue
 
         style_name = getattr(paragraph.style, "name", None)
-        heading_level = detect_heading_level(style_name)
+        if style_name in style_cache:
+            heading_level = style_cache[style_name]
+        else:
+            heading_level = style_cache[style_name] = detect_heading_level(style_name)
         if heading_level is not None:
             blocks.append({
                 "type": "heading",
@@ -61,5 +127,56 @@ def summarize_structure(blocks: List[Dict[str, Any]]) -> Dict[str, Any]:
 
 
 def extract_full_text(doc: Document, max_chars: int = 20000) -> str:
-    text = "\n".join(p.text for p in doc.paragraphs)
-    return text[:max_chars]
+    return join_truncated(get_paragraph_texts(doc), max_chars)
+
+
+def _collect_run_text(node, parts: List[str]) -> None:
+    # Mirrors python-docx Paragraph.text for the common run content
+    for child in node:
+        tag = child.tag
+        if tag == _W_T:
+            parts.append(child.text or "")
+        elif tag == _W_TAB:
+            parts.append("\t")
+        elif tag == _W_BR:
+            # Page/column breaks carry no text
+            parts.append("\n" if child.get(_W_TYPE, "textWrapping") == "textWrapping" else "")
+        elif tag == _W_CR:
+            parts.append("\n")
+        elif tag == _W_HYPHEN:
+            parts.append("-")
+        elif tag not in _W_PROPS and tag != _MC_FALLBACK:
+            _collect_run_text(child, parts)
+
+
+def fast_extract_text(data: bytes, max_chars: Optional[int] = None) -> str:
+    """
+    Text-only .docx extraction: streams word/document.xml and never builds the
+    python-docx object model (styles, numbering, runs). Stops once max_chars is
+    covered. Unlike doc.paragraphs this also includes paragraphs inside tables and
+    text boxes (w:txbxContent), each as its own line; the mc:Fallback copy of a
+    text box is skipped so its text appears once.
+    Use load_document_from_bytes when the Document itself is needed (annotation).
+    """
+    paragraphs: List[str] = []
+    total = 0
+    in_fallback = 0
+    with zipfile.ZipFile(BytesIO(data)) as zf, zf.open("word/document.xml") as xml:
+        for event, elem in iterparse(xml, events=("start", "end")):
+            if elem.tag == _MC_FALLBACK:
+                in_fallback += 1 if event == "start" else -1
+                continue
+            if event != "end" or elem.tag != _W_P or in_fallback:
+                continue
+            parts: List[str] = []
+            _collect_run_text(elem, parts)
+            text = "".join(parts)
+            # Free the subtree; a nested paragraph (e.g. in a text box) is then
+            # not repeated by its enclosing paragraph
+            elem.clear()
+            paragraphs.append(text)
+            total += len(text) + 1
+            if max_chars is not None and total > max_chars:
+                break
+    text = "\n".join(paragraphs)
+    return text if max_chars is None else text[:max_chars]
@@ -3,8 +3,14 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
+
 
 MANIFEST_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "sources_manifest.json")
 
@@ -22,34 +28,45 @@ class SourceEntry:
 class SourcesManifest:
     def __init__(self, sources: List[SourceEntry]):
         self.sources = sources
+        self._by_id: Dict[str, SourceEntry] = {}
+        self._by_type: Dict[str, List[SourceEntry]] = {}
+        for s in sources:
+            # First entry wins on duplicate ids, as with the previous linear scan
+            self._by_id.setdefault(s.id, s)
+            self._by_type.setdefault(s.type, []).append(s)
 
     @classmethod
     def load(cls, path: Optional[str] = None) -> "SourcesManifest":
-        manifest_path = path or MANIFEST_PATH
-        with open(manifest_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        entries: List[SourceEntry] = []
-        for item in data.get("sources", []):
-            entries.append(
-                SourceEntry(
-                    id=item["id"],
-                    title=item["title"],
-                    type=item["type"],
-                    path=item["path"],
-                    citation=item.get("citation", ""),
-                    scope=item.get("scope", []),
-                )
-            )
-        return cls(entries)
+        manifest_path = os.path.abspath(path or MANIFEST_PATH)
+        st = os.stat(manifest_path)
+        # Keyed on mtime/size too so an edited manifest is picked up on the next load
+        return _load_manifest(manifest_path, st.st_mtime_ns, st.st_size)
 
     def by_type(self, source_type: str) -> List[SourceEntry]:
-        return [s for s in self.sources if s.type == source_type]
+        return list(self._by_type.get(source_type, ()))
 
     def find(self, source_id: str) -> Optional[SourceEntry]:
-        for s in self.sources:
-            if s.id == source_id:
-                return s
-        return None
+        return self._by_id.get(source_id)
 
     def all(self) -> List[SourceEntry]:
         return list(self.sources)
+
+
+@lru_cache(maxsize=8)
+def _load_manifest(manifest_path: str, mtime_ns: int, size: int) -> SourcesManifest:
+    with open(manifest_path, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    entries: List[SourceEntry] = []
+    for item in data.get("sources", []):
+        entries.append(
+            SourceEntry(
+                id=item["id"],
+                title=item["title"],
+                type=item["type"],
+                path=item["path"],
+                citation=item.get("citation", ""),
+                scope=item.get("scope", []),
+            )
+        )
+    return SourcesManifest(entries)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import List, Optional
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from agent.config import CONFIG
 
@@ -20,6 +22,25 @@ class GeminiClient:
             self.model = genai.GenerativeModel(model_name)
         else:
             self.model = None
+        # system instruction -> model bound to it
+        self._instructed_models: Dict[str, Any] = {}
+        self._instructed_lock = threading.Lock()
+
+    def generate_with_instruction(self, system_instruction: str, prompt: str) -> str:
+        """
+        Generates a completion with a static system instruction. One model is kept per
+        instruction, so every call shares the same prefix (eligible for Gemini's
+        implicit prefix caching) and only the per-call prompt varies.
+        """
+        if not self.enabled or not self.model:
+            return ""
+        with self._instructed_lock:
+            model = self._instructed_models.get(system_instruction)
+            if model is None:
+                model = genai.GenerativeModel(self.model_name, system_instruction=system_instruction)
+                self._instructed_models[system_instruction] = model
+        resp = model.generate_content(prompt)
+        return getattr(resp, "text", "").strip()
 
     def classify(self, text: str, labels: List[str]) -> Optional[str]:
         if not self.enabled or not self.model:
@@ -44,3 +65,10 @@ class GeminiClient:
                 return None
         except Exception:
             return None
+
+
+@lru_cache(maxsize=1)
+def get_gemini_client(model_name: str = "gemini-1.5-flash") -> GeminiClient:
+    # Shared instance: avoids re-running genai.configure/GenerativeModel per call and
+    # keeps the per-instruction models built by generate_with_instruction across calls.
+    return GeminiClient(model_name)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from agent.rag.ingest import query_improved
+
+
+# In-process LRU + TTL cache of retrieved passages. Documents of the same type
+# issue identical RAG queries, so repeat lookups skip embedding + vector search + rerank.
+_MAX_ENTRIES = 256
+_TTL_SECONDS = 600.0
+
+_CacheKey = Tuple[str, int, int, str, Tuple[str, ...], Tuple[str, ...], bool]
+
+_cache: "OrderedDict[_CacheKey, Tuple[float, Tuple[Dict[str, str], ...]]]" = OrderedDict()
+_lock = threading.Lock()
+# Single-flight: concurrent misses on one key share the first caller's retrieval
+_inflight: "Dict[_CacheKey, Future]" = {}
+_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+
+def _make_key(
+    query_text: str,
+    top_k: int,
+    pre_k: int,
+    collection_name: str,
+    filter_scopes: Optional[List[str]],
+    filter_source_ids: Optional[List[str]],
+    use_reranker: bool,
+) -> _CacheKey:
+    return (
+        query_text,
+        top_k,
+        pre_k,
+        collection_name,
+        tuple(filter_scopes or ()),
+        tuple(filter_source_ids or ()),
+        use_reranker,
+    )
+
+
+def cached_query_improved(
+    query_text: str,
+    top_k: int = 5,
+    pre_k: int = 30,
+    collection_name: str = "adgm_sources",
+    filter_scopes: Optional[List[str]] = None,
+    filter_source_ids: Optional[List[str]] = None,
+    use_reranker: bool = True,
+) -> List[Dict[str, str]]:
+    key = _make_key(query_text, top_k, pre_k, collection_name, filter_scopes, filter_source_ids, use_reranker)
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and now - entry[0] < _TTL_SECONDS:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return [dict(p) for p in entry[1]]
+        waiting = _inflight.get(key)
+        if waiting is None:
+            _stats["misses"] += 1
+            future: Future = Future()
+            _inflight[key] = future
+        else:
+            _stats["hits"] += 1
+
+    if waiting is not None:
+        return [dict(p) for p in waiting.result()]
+
+    # Retrieval runs outside the lock; errors propagate (to waiters too) and are not cached
+    try:
+        passages = tuple(
+            query_improved(
+                query_text=query_text,
+                top_k=top_k,
+                pre_k=pre_k,
+                collection_name=collection_name,
+                filter_scopes=filter_scopes,
+                filter_source_ids=filter_source_ids,
+                use_reranker=use_reranker,
+            )
+        )
+    except BaseException as e:
+        with _lock:
+            _inflight.pop(key, None)
+        future.set_exception(e)
+        raise
+
+    with _lock:
+        _cache[key] = (time.monotonic(), passages)
+        _cache.move_to_end(key)
+        while len(_cache) > _MAX_ENTRIES:
+            _cache.popitem(last=False)
+        _inflight.pop(key, None)
+    future.set_result(passages)
+    return [dict(p) for p in passages]
+
+
+def clear_retrieval_cache() -> None:
+    with _lock:
+        _cache.clear()
+
+
+def retrieval_cache_stats() -> Dict[str, int]:
+    with _lock:
+        return {**_stats, "size": len(_cache)}
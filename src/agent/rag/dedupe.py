@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, List
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _shingles(text: str, k: int) -> FrozenSet[int]:
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) < k:
+        return frozenset([hash(tuple(words))]) if words else frozenset()
+    return frozenset(hash(tuple(words[i:i + k])) for i in range(len(words) - k + 1))
+
+
+def _jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def dedupe_passages(passages: List[Dict[str, str]], k_shingle: int = 5, threshold: float = 0.8) -> List[Dict[str, str]]:
+    """
+    Drops passages whose word k-shingle Jaccard similarity with an earlier kept
+    passage is >= threshold (overlapping chunks of the same source). Order, and
+    therefore reranker ranking, is preserved.
+    """
+    kept: List[Dict[str, str]] = []
+    kept_shingles: List[FrozenSet[int]] = []
+    for p in passages:
+        sh = _shingles(p.get("text", ""), k_shingle)
+        if any(_jaccard(sh, other) >= threshold for other in kept_shingles):
+            continue
+        kept.append(p)
+        kept_shingles.append(sh)
+    return kept
+
+
+def truncate_passage_text(text: str, max_chars: int = 800) -> str:
+    # Bounds prompt size; only used when rendering passages into a prompt
+    text = text or ""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rstrip() + "…"
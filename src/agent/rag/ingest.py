@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
 
+from agent.config import CONFIG
 from agent.knowledge.manifest import SourcesManifest, SourceEntry
 
 # Parsers
@@ -12,6 +18,11 @@ try:
 except Exception:
     BeautifulSoup = None  # type: ignore
 
+try:
+    import fitz  # type: ignore  # PyMuPDF
+except Exception:
+    fitz = None  # type: ignore
+
 try:
     import pypdf  # type: ignore
 except Exception:
@@ -22,7 +33,17 @@ try:
 except Exception:
     docx = None  # type: ignore
 
+try:
+    from agent.doc_processing.parser import fast_extract_text
+except Exception:
+    fast_extract_text = None  # type: ignore
+
 # Embeddings & Vector store
+try:
+    import torch  # type: ignore
+except Exception:
+    torch = None  # type: ignore
+
 try:
     from sentence_transformers import SentenceTransformer  # type: ignore
 except Exception:
@@ -30,10 +51,20 @@ except Exception:
 
 try:
     import chromadb  # type: ignore
-    from chromadb.utils import embedding_functions  # type: ignore
 except Exception:
     chromadb = None  # type: ignore
-    embedding_functions = None  # type: ignore
+
+# Optional quantized vector store (USearch ANN index, else a memory-mapped NumPy matrix)
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # type: ignore
+
+try:
+    from usearch.index import Index as USearchIndex, ScalarKind  # type: ignore
+except Exception:
+    USearchIndex = None  # type: ignore
+    ScalarKind = None  # type: ignore
 
 # Optional reranker
 try:
@@ -42,25 +73,168 @@ except Exception:
     CrossEncoder = None  # type: ignore
 
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+TEXT_CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache", "text")
+
+
+def _default_persist_dir() -> str:
+    # Resolved on use, not at import, so CHROMA_PERSIST_DIR from .env is honoured;
+    # a relative path is taken from the project root, not the working directory
+    return os.path.join(PROJECT_ROOT, CONFIG.chroma_persist_dir or ".chroma")
+
+# HNSW index settings applied when the collection is first created
+HNSW_METADATA: Dict[str, object] = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 64,
+    "hnsw:search_ef": 100,
+}
+
+
 @dataclass
 class IngestConfig:
     collection_name: str = "adgm_sources"
     chunk_size: int = 800
     chunk_overlap: int = 150
     embedding_model: str = "sentence-transformers/all-mpnet-base-v2"
+    persist_dir: str = field(default_factory=_default_persist_dir)
+    add_batch_size: int = 512
+    embed_batch_size: int = 64
+    # Optional quantized store ("i8", "f16"): vectors are kept only in a USearch index
+    # (or NumPy matrix) and chunk text/metadata in a JSON sidecar, instead of Chroma
+    quantization: Optional[str] = None
+    # 2-layer cross-encoder: ranks like MiniLM-L-6 on prose at a fraction of the latency
+    reranker_model: str = "cross-encoder/ms-marco-TinyBERT-L-2-v2"
+
+
+@lru_cache(maxsize=1)
+def _torch_device() -> str:
+    try:
+        if torch is not None and torch.cuda.is_available():
+            return "cuda"
+    except Exception:
+        pass
+    return "cpu"
 
 
-def _resolve_source_path(root_dir: str, rel_path: str) -> Optional[str]:
-    candidates = [
+# Loaded models keyed by (kind, model name). lru_cache does not stop concurrent
+# first calls from each constructing the model, so loads are double-checked under a lock.
+_MODELS: Dict[Tuple[str, str], object] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def _load_once(kind: str, model_name: str, loader):
+    key = (kind, model_name)
+    model = _MODELS.get(key)
+    if model is None:
+        with _MODELS_LOCK:
+            model = _MODELS.get(key)
+            if model is None:
+                model = loader(model_name)
+                _MODELS[key] = model
+    return model
+
+
+def _build_embedder(model_name: str):
+    device = _torch_device()
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda":
+        # FP16 on GPU; CPU stays FP32 since half precision is slower there
+        model.half()
+    return model
+
+
+def get_embedder(model_name: str):
+    # Loaded once per model; shared by ingestion, queries and the Q&A semantic cache
+    assert SentenceTransformer is not None, "sentence-transformers not installed"
+    return _load_once("embedder", model_name, _build_embedder)
+
+
+# Reranker models that failed to load (e.g. offline); not retried per query
+_FAILED_RERANKERS: Set[str] = set()
+
+
+def _build_reranker(model_name: str):
+    device = _torch_device()
+    reranker = CrossEncoder(model_name, device=device)
+    if device == "cuda":
+        reranker.model.half()
+    return reranker
+
+
+def _load_reranker(model_name: str):
+    # Weights/tokenizer are loaded on first use, not per query
+    return _load_once("reranker", model_name, _build_reranker)
+
+
+def _get_reranker(model_name: str):
+    if CrossEncoder is None or model_name in _FAILED_RERANKERS:
+        return None
+    try:
+        return _load_reranker(model_name)
+    except Exception:
+        _FAILED_RERANKERS.add(model_name)
+        return None
+
+
+def _encode(model_name: str, texts: List[str], batch_size: int = 64):
+    embs = get_embedder(model_name).encode(
+        texts,
+        batch_size=batch_size,
+        show_progress_bar=False,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+    return embs.astype("float32", copy=False)
+
+
+@lru_cache(maxsize=4)
+def _get_client(persist_dir: str):
+    # On-disk client: the index survives restarts instead of being rebuilt per session
+    return chromadb.PersistentClient(path=persist_dir)
+
+
+def _source_path_candidates(root_dir: str, rel_path: str) -> List[str]:
+    return [
         os.path.join(root_dir, rel_path),
         os.path.join(root_dir, "data", rel_path),
     ]
-    for p in candidates:
+
+
+def _resolve_source_path(root_dir: str, rel_path: str) -> Optional[str]:
+    for p in _source_path_candidates(root_dir, rel_path):
         if os.path.exists(p):
             return p
     return None
 
 
+def _resolve_source_paths(root_dir: str, sources: List[SourceEntry]) -> Dict[str, Optional[str]]:
+    # Resolves a whole manifest with one listdir() per directory instead of up to
+    # two stat() calls per source; keyed by the manifest-relative path. Names not in
+    # the listing fall back to os.path.exists, which matches case-insensitively on
+    # filesystems that do (macOS, Windows), as _resolve_source_path does; a missing
+    # directory is recorded as None so its candidates are never stat()ed.
+    listings: Dict[str, Optional[Set[str]]] = {}
+
+    def _exists(p: str) -> bool:
+        parent, name = os.path.split(os.path.normpath(p))
+        if parent not in listings:
+            try:
+                listings[parent] = set(os.listdir(parent))
+            except (FileNotFoundError, NotADirectoryError):
+                listings[parent] = None
+            except OSError:
+                listings[parent] = set()
+        listing = listings[parent]
+        return listing is not None and (name in listing or os.path.exists(p))
+
+    resolved: Dict[str, Optional[str]] = {}
+    for src in sources:
+        if src.path not in resolved:
+            resolved[src.path] = next((p for p in _source_path_candidates(root_dir, src.path) if _exists(p)), None)
+    return resolved
+
+
 def _read_text(abs_path: str) -> str:
     _, ext = os.path.splitext(abs_path)
     ext = ext.lower()
@@ -71,6 +245,13 @@ def _read_text(abs_path: str) -> str:
         soup = BeautifulSoup(html, "html.parser")
         return soup.get_text(separator="\n")
 
+    if ext in [".pdf"] and fitz:
+        try:
+            with fitz.open(abs_path) as pdf:
+                return "\n".join(page.get_text() for page in pdf)
+        except Exception:
+            pass
+
     if ext in [".pdf"] and pypdf:
         text = []
         with open(abs_path, "rb") as f:
@@ -79,6 +260,13 @@ def _read_text(abs_path: str) -> str:
                 text.append(page.extract_text() or "")
         return "\n".join(text)
 
+    if ext in [".docx"] and fast_extract_text:
+        try:
+            with open(abs_path, "rb") as f:
+                return fast_extract_text(f.read())
+        except Exception:
+            pass
+
     if ext in [".docx"] and docx:
         d = docx.Document(abs_path)
         return "\n".join(p.text for p in d.paragraphs)
@@ -90,100 +278,371 @@ def _read_text(abs_path: str) -> str:
         return ""
 
 
+def _extractor_tag(abs_path: str) -> str:
+    # Which parser _read_text will use for this file; part of the text-cache key and
+    # the ingest fingerprint so installing a different parser re-extracts the text
+    ext = os.path.splitext(abs_path)[1].lower()
+    if ext == ".pdf":
+        return "fitz" if fitz else "pypdf" if pypdf else "raw"
+    if ext == ".docx":
+        return "fast_docx" if fast_extract_text else "docx" if docx else "raw"
+    if ext in (".html", ".htm"):
+        return "bs4" if BeautifulSoup else "raw"
+    return "raw"
+
+
+def _cached_read_text(abs_path: str) -> str:
+    # Extracted text keyed by (path, mtime, size, extractor): unchanged sources are never re-parsed
+    st = os.stat(abs_path)
+    key = hashlib.sha1(
+        f"{os.path.abspath(abs_path)}|{st.st_mtime_ns}|{st.st_size}|{_extractor_tag(abs_path)}".encode("utf-8")
+    ).hexdigest()
+    cache_path = os.path.join(TEXT_CACHE_DIR, f"{key}.txt")
+    try:
+        with open(cache_path, "r", encoding="utf-8", errors="surrogatepass") as f:
+            return f.read()
+    except (OSError, UnicodeError):
+        pass
+
+    text = _read_text(abs_path)
+    if not text:
+        return text
+    try:
+        os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", errors="surrogatepass") as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return text
+
+
 def read_text_from_source(root_dir: str, source: SourceEntry) -> str:
     abs_path = _resolve_source_path(root_dir, source.path)
     if not abs_path:
         return ""
-    return _read_text(abs_path)
+    return _cached_read_text(abs_path)
 
 
 def chunk_text(text: str, size: int, overlap: int) -> List[str]:
-    chunks: List[str] = []
-    start = 0
-    while start < len(text):
-        end = min(len(text), start + size)
-        chunk = text[start:end]
-        if chunk:
-            chunks.append(chunk)
-        if end == len(text):
-            break
-        start = max(0, end - overlap)
-    return chunks
-
-
-def get_or_create_collection(client, name: str, embedding_func):
+    if not text:
+        return []
+    # Windows advance by size - overlap; the last one starts before len - overlap,
+    # i.e. the first window that reaches the end of the text
+    step = max(1, size - overlap)
+    return [text[s:s + size] for s in range(0, max(1, len(text) - overlap), step)]
+
+
+def get_or_create_collection(client, name: str, embedding_model: str):
     try:
         return client.get_collection(name)
     except Exception:
-        return client.create_collection(name=name, embedding_function=embedding_func)
+        # Embeddings are computed by us, not by Chroma; record the model so queries embed with the same one
+        return client.create_collection(name=name, metadata={**HNSW_METADATA, "embedding_model": embedding_model})
+
+
+def _collection_embedding_model(collection) -> str:
+    return (collection.metadata or {}).get("embedding_model") or IngestConfig.embedding_model
+
+
+def _ingest_fingerprint(manifest_path: str, manifest: SourcesManifest, paths: Dict[str, Optional[str]], cfg: IngestConfig) -> str:
+    # Changes to the manifest, any source file or its extractor, or chunking/embedding settings force a re-ingest
+    h = hashlib.sha1()
+    with open(manifest_path, "rb") as f:
+        h.update(f.read())
+    for src in manifest.all():
+        resolved = paths.get(src.path)
+        if resolved:
+            st = os.stat(resolved)
+            h.update(f"{src.id}|{st.st_mtime_ns}|{st.st_size}|{_extractor_tag(resolved)}".encode("utf-8"))
+    h.update(f"{cfg.chunk_size}|{cfg.chunk_overlap}|{cfg.embedding_model}|{cfg.quantization}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _fingerprint_path(cfg: IngestConfig) -> str:
+    return os.path.join(cfg.persist_dir, f"{cfg.collection_name}.ingest.json")
+
+
+def _quantized_paths(persist_dir: str, collection_name: str) -> Tuple[str, str, str]:
+    # (USearch index, NumPy matrix, sidecar with the id, text and metadata of each row)
+    base = os.path.join(persist_dir, collection_name)
+    return base + ".usearch", base + ".vectors.npy", base + ".chunks.json"
+
+
+def _remove_quantized_index(persist_dir: str, collection_name: str) -> None:
+    for p in _quantized_paths(persist_dir, collection_name):
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+
+def _quantize_rows(embs, kind: str):
+    # Embeddings are unit-normalized, so int8 uses a fixed global scale of 127
+    if kind == "i8":
+        return np.round(embs * 127.0).astype(np.int8)
+    return embs.astype(np.float16)
+
+
+@lru_cache(maxsize=4)
+def _load_quantized_store(path: str, chunks_path: str, mtime_ns: int):
+    # Both backends are memory-mapped rather than read into RAM; the cache key is the
+    # sidecar's mtime (written last by ingest) so a re-ingest is picked up
+    if path.endswith(".usearch"):
+        index = USearchIndex.restore(path, view=True)
+    else:
+        index = np.load(path, mmap_mode="r")
+    with open(chunks_path, "r", encoding="utf-8") as f:
+        chunks = json.load(f)
+    return index, chunks
+
+
+def _get_quantized_store(persist_dir: str, collection_name: str):
+    index_path, matrix_path, chunks_path = _quantized_paths(persist_dir, collection_name)
+    if not os.path.exists(chunks_path):
+        return None
+    for path, available in ((index_path, USearchIndex is not None), (matrix_path, np is not None)):
+        if available and os.path.exists(path):
+            try:
+                return _load_quantized_store(path, chunks_path, os.stat(chunks_path).st_mtime_ns)
+            except Exception:
+                return None
+    return None
+
 
+def _top_rows(scores, n_results: int) -> List[int]:
+    n = min(n_results, scores.shape[0])
+    if n <= 0:
+        return []
+    top = np.argpartition(-scores, n - 1)[:n]
+    return top[np.argsort(-scores[top])].tolist()
+
+
+def _matrix_scores(matrix, q):
+    # Exact dot-product scan over the mmapped rows against a query quantized the same
+    # way; einsum accumulates in int32/float32 without an upcast copy of the matrix
+    q_quant = _quantize_rows(q, "i8" if matrix.dtype == np.int8 else "f16")
+    return np.einsum("ij,j->i", matrix, q_quant, dtype=np.int32 if matrix.dtype == np.int8 else np.float32)
+
+
+def _search_quantized(store, query_text: str, n_results: int, source_ids: Optional[List[str]]) -> Tuple[List[str], List[Dict]]:
+    index, chunks = store
+    rows = chunks["rows"]
+    metas = chunks["metadatas"]
+    if not rows:
+        return [], []
+    q = _encode(chunks["embedding_model"], [query_text])[0]
+    if source_ids:
+        # Exact scores over just the rows of the requested sources
+        wanted = set(source_ids)
+        selected = np.array([i for i, r in enumerate(rows) if metas[r[2]]["source_id"] in wanted], dtype=np.int64)
+        if not selected.size:
+            return [], []
+        if isinstance(index, np.ndarray):
+            scores = _matrix_scores(index[selected], q)
+        else:
+            scores = np.vstack(index.get(selected, dtype=np.float32)) @ q
+        keys = [int(selected[i]) for i in _top_rows(scores, n_results)]
+    elif isinstance(index, np.ndarray):
+        keys = _top_rows(_matrix_scores(index, q), n_results)
+    else:
+        keys = [int(k) for k in index.search(q, n_results).keys]
+    return [rows[k][1] for k in keys], [metas[rows[k][2]] for k in keys]
+
+
+def _search(
+    persist_dir: str,
+    collection_name: str,
+    query_text: str,
+    n_results: int,
+    source_ids: Optional[List[str]] = None,
+) -> Tuple[List[str], List[Dict]]:
+    """
+    Nearest chunks for query_text as (documents, metadatas), optionally limited to
+    chunks of the given source ids. Searches the quantized store when ingest wrote
+    one (IngestConfig.quantization) and the Chroma collection otherwise.
+    """
+    store = _get_quantized_store(persist_dir, collection_name)
+    if store is not None:
+        return _search_quantized(store, query_text, n_results, source_ids)
 
-def ingest_sources(root_dir: str, config: Optional[IngestConfig] = None) -> Dict[str, int]:
+    assert chromadb is not None, "chromadb not installed"
+    collection = _get_client(persist_dir).get_collection(collection_name)
+    q_emb = _encode(_collection_embedding_model(collection), [query_text])
+    where = {"source_id": {"$in": list(source_ids)}} if source_ids else None
+    result = collection.query(query_embeddings=q_emb.tolist(), n_results=n_results, where=where)
+    return result.get("documents", [[]])[0], result.get("metadatas", [[]])[0]
+
+
+def ingest_sources(root_dir: str, config: Optional[IngestConfig] = None, force: bool = False) -> Dict[str, int]:
     assert chromadb is not None, "chromadb not installed"
     assert SentenceTransformer is not None, "sentence-transformers not installed"
 
     cfg = config or IngestConfig()
 
-    manifest = SourcesManifest.load(os.path.join(root_dir, "data", "sources_manifest.json"))
+    manifest_path = os.path.join(root_dir, "data", "sources_manifest.json")
+    manifest = SourcesManifest.load(manifest_path)
 
-    client = chromadb.Client()
-    embedding_func = embedding_functions.SentenceTransformerEmbeddingFunction(model_name=cfg.embedding_model)
-    collection = get_or_create_collection(client, cfg.collection_name, embedding_func)
+    os.makedirs(cfg.persist_dir, exist_ok=True)
+    client = _get_client(cfg.persist_dir)
 
-    total_chunks = 0
+    sources = manifest.all()
+    paths = _resolve_source_paths(root_dir, sources)
+    fingerprint = _ingest_fingerprint(manifest_path, manifest, paths, cfg)
+    fp_path = _fingerprint_path(cfg)
+    if not force and os.path.exists(fp_path):
+        try:
+            with open(fp_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("fingerprint") == fingerprint:
+                store = _get_quantized_store(cfg.persist_dir, cfg.collection_name)
+                if store is not None:
+                    return {"chunks_indexed": len(store[1]["rows"])}
+                existing = client.get_collection(cfg.collection_name)
+                return {"chunks_indexed": existing.count()}
+        except Exception:
+            pass
 
-    for src in manifest.all():
-        text = read_text_from_source(root_dir, src)
+    # Sources changed (or first run): rebuild so stale chunks don't linger. The
+    # fingerprint goes first and is only rewritten once the rebuild has finished,
+    # so an interrupted ingest is never mistaken for an up-to-date index.
+    try:
+        os.remove(fp_path)
+    except OSError:
+        pass
+    try:
+        client.delete_collection(cfg.collection_name)
+    except Exception:
+        pass
+    _remove_quantized_index(cfg.persist_dir, cfg.collection_name)
+
+    # With quantization the int8/fp16 vectors go only to a USearch index (created on
+    # the first batch so ndim comes from the actual embeddings), or else a NumPy
+    # matrix, and Chroma is not used; otherwise everything goes to the collection
+    use_usearch = bool(cfg.quantization) and USearchIndex is not None
+    use_matrix = bool(cfg.quantization) and not use_usearch and np is not None
+    collection = None
+    if not (use_usearch or use_matrix):
+        collection = get_or_create_collection(client, cfg.collection_name, cfg.embedding_model)
+    quantized = None
+    quantized_rows: List[object] = []
+    # Sidecar rows are [chunk id, text, index into sidecar_metas]; row i is vector key i
+    sidecar_rows: List[list] = []
+    sidecar_metas: List[Dict[str, str]] = []
+
+    total_chunks = 0
+    buf_ids: List[str] = []
+    buf_docs: List[str] = []
+    buf_metas: List[Dict[str, str]] = []
+
+    def flush(final: bool = False) -> None:
+        nonlocal quantized
+        # Large batches amortize embedding + index insert overhead across sources
+        size = max(1, cfg.add_batch_size)
+        while len(buf_ids) >= size or (final and buf_ids):
+            ids, docs = buf_ids[:size], buf_docs[:size]
+            embs = _encode(cfg.embedding_model, docs, batch_size=cfg.embed_batch_size)
+            if use_usearch:
+                if quantized is None:
+                    quantized = USearchIndex(ndim=embs.shape[1], metric="cos", dtype=getattr(ScalarKind, cfg.quantization.upper()))
+                start = len(quantized)
+                quantized.add(np.arange(start, start + len(ids)), embs)
+            elif use_matrix:
+                quantized_rows.append(_quantize_rows(embs, cfg.quantization))
+            else:
+                collection.add(ids=ids, documents=docs, metadatas=buf_metas[:size], embeddings=embs.tolist())
+            del buf_ids[:size], buf_docs[:size], buf_metas[:size]
+
+    # Parsing is per-file I/O + decompression, so sources are read concurrently;
+    # map() keeps manifest order for chunk ids and batching
+    def _read(src: SourceEntry) -> str:
+        abs_path = paths.get(src.path)
+        return _cached_read_text(abs_path) if abs_path else ""
+
+    with ThreadPoolExecutor(max_workers=max(1, min(32, os.cpu_count() or 4, len(sources)))) as ex:
+        texts = list(ex.map(_read, sources))
+
+    for src, text in zip(sources, texts):
         if not text or not text.strip():
             continue
         chunks = chunk_text(text, cfg.chunk_size, cfg.chunk_overlap)
         if not chunks:
             continue
-        ids = [f"{src.id}_{i}" for i in range(len(chunks))]
         scope_str = ";".join(src.scope) if src.scope else ""
-        metadatas = [{
+        buf_ids.extend(f"{src.id}_{i}" for i in range(len(chunks)))
+        buf_docs.extend(chunks)
+        # One dict shared by all chunks of the source; Chroma only reads it
+        meta = {
             "source_id": src.id,
             "title": src.title,
             "type": src.type,
             "citation": src.citation,
             "scope": scope_str,
-        } for _ in chunks]
-        collection.add(ids=ids, documents=chunks, metadatas=metadatas)
+        }
+        buf_metas.extend([meta] * len(chunks))
+        if use_usearch or use_matrix:
+            sidecar_rows.extend([f"{src.id}_{i}", c, len(sidecar_metas)] for i, c in enumerate(chunks))
+            sidecar_metas.append(meta)
         total_chunks += len(chunks)
+        flush()
+    flush(final=True)
+
+    if use_usearch or use_matrix:
+        index_path, matrix_path, chunks_path = _quantized_paths(cfg.persist_dir, cfg.collection_name)
+        if quantized is not None:
+            quantized.save(index_path)
+        elif quantized_rows:
+            np.save(matrix_path, np.vstack(quantized_rows))
+        else:
+            # No chunks: an empty matrix still marks the store as built
+            np.save(matrix_path, np.zeros((0, 0), dtype=np.int8))
+        with open(chunks_path, "w", encoding="utf-8") as f:
+            json.dump({"embedding_model": cfg.embedding_model, "metadatas": sidecar_metas, "rows": sidecar_rows}, f)
+
+    with open(fp_path, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "chunks_indexed": total_chunks}, f)
 
     return {"chunks_indexed": total_chunks}
 
 
-def inspect_sources(root_dir: str) -> List[Dict[str, str]]:
+def inspect_sources(root_dir: str, deep: bool = False) -> List[Dict[str, str]]:
+    # File size comes from stat(); the extracted text length needs a full parse,
+    # so it is only reported with deep=True
     manifest = SourcesManifest.load(os.path.join(root_dir, "data", "sources_manifest.json"))
     out: List[Dict[str, str]] = []
-    for src in manifest.all():
-        resolved = _resolve_source_path(root_dir, src.path)
-        exists = bool(resolved and os.path.exists(resolved))
-        length = 0
+    sources = manifest.all()
+    paths = _resolve_source_paths(root_dir, sources)
+    for src in sources:
+        resolved = paths.get(src.path)
+        exists = resolved is not None
+        size = 0
         ext = ""
         if resolved and exists:
             ext = os.path.splitext(resolved)[1].lower()
-            text = _read_text(resolved)
-            length = len(text or "")
-        out.append({
+            size = os.path.getsize(resolved)
+        entry = {
             "id": src.id,
             "path": src.path,
             "resolved": resolved or "(not found)",
             "exists": str(exists),
             "ext": ext,
-            "text_length": str(length),
-        })
+            "size_bytes": str(size),
+        }
+        if deep:
+            entry["text_length"] = str(len(_cached_read_text(resolved) or "")) if resolved and exists else "0"
+        out.append(entry)
     return out
 
 
-def query(top_k: int, query_text: str, collection_name: str = "adgm_sources") -> List[Dict[str, str]]:
-    assert chromadb is not None, "chromadb not installed"
-    client = chromadb.Client()
-    collection = client.get_collection(collection_name)
-    result = collection.query(query_texts=[query_text], n_results=top_k)
-    docs = result.get("documents", [[]])[0]
-    metas = result.get("metadatas", [[]])[0]
+def query(
+    top_k: int,
+    query_text: str,
+    collection_name: str = "adgm_sources",
+    persist_dir: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    persist_dir = persist_dir or _default_persist_dir()
+    docs, metas = _search(persist_dir, collection_name, query_text, top_k)
     out: List[Dict[str, str]] = []
     for d, m in zip(docs, metas):
         out.append({"text": d, **{k: str(v) for k, v in (m or {}).items()}})
@@ -198,39 +657,63 @@ def query_improved(
     filter_scopes: Optional[List[str]] = None,
     filter_source_ids: Optional[List[str]] = None,
     use_reranker: bool = True,
+    persist_dir: Optional[str] = None,
+    reranker_model: Optional[str] = None,
 ) -> List[Dict[str, str]]:
-    assert chromadb is not None, "chromadb not installed"
-    client = chromadb.Client()
-    collection = client.get_collection(collection_name)
+    persist_dir = persist_dir or _default_persist_dir()
 
-    pre = collection.query(query_texts=[query_text], n_results=max(pre_k, top_k))
-    docs = pre.get("documents", [[]])[0]
-    metas = pre.get("metadatas", [[]])[0]
+    n_results = max(pre_k, top_k)
+    docs: List[str] = []
+    metas: List[Dict] = []
+    if filter_source_ids:
+        # Source ids are exact metadata values, so the candidate budget is spent on
+        # them in the index. Scope is a ";"-joined string and is filtered below.
+        docs, metas = _search(persist_dir, collection_name, query_text, n_results, source_ids=filter_source_ids)
+    if not docs:
+        docs, metas = _search(persist_dir, collection_name, query_text, n_results)
 
     candidates: List[Tuple[str, Dict[str, str]]] = []
     for d, m in zip(docs, metas):
         md = {k: str(v) for k, v in (m or {}).items()}
         candidates.append((d, md))
 
-    if filter_scopes:
-        scope_lower = [s.lower() for s in filter_scopes]
-        filtered = [
-            (d, m) for (d, m) in candidates
-            if any(s in m.get("scope", "").lower() for s in scope_lower)
-        ]
-        if filtered:
-            candidates = filtered
-
-    if filter_source_ids:
-        filtered = [(d, m) for (d, m) in candidates if m.get("source_id") in set(filter_source_ids)]
-        if filtered:
-            candidates = filtered
-
-    if use_reranker and CrossEncoder is not None and candidates:
+    # Scope and source-id filters in one pass. Each filter is dropped when nothing
+    # matches it, so both predicates are tracked per candidate.
+    scope_lower = [s.lower() for s in filter_scopes] if filter_scopes else None
+    src_set = set(filter_source_ids) if filter_source_ids else None
+    if scope_lower or src_set:
+        by_scope: List[Tuple[str, Dict[str, str]]] = []
+        by_both: List[Tuple[str, Dict[str, str]]] = []
+        by_src: List[Tuple[str, Dict[str, str]]] = []
+        for c in candidates:
+            m = c[1]
+            scope_ok = scope_lower is None or any(s in m.get("scope", "").lower() for s in scope_lower)
+            src_ok = src_set is None or m.get("source_id") in src_set
+            if scope_ok:
+                by_scope.append(c)
+                if src_ok:
+                    by_both.append(c)
+            if src_ok:
+                by_src.append(c)
+        if by_scope:
+            candidates = by_both or by_scope
+        elif by_src:
+            candidates = by_src
+
+    # With no more candidates than top_k the cross-encoder cannot change which
+    # passages are returned, so it is skipped
+    reranker = None
+    if use_reranker and len(candidates) > top_k:
+        reranker = _get_reranker(reranker_model or IngestConfig.reranker_model)
+    if reranker is not None:
         try:
-            reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
             pairs = [(query_text, d) for (d, _) in candidates]
-            scores = reranker.predict(pairs)
+            scores = reranker.predict(
+                pairs,
+                batch_size=min(len(pairs), 64),
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
             ranked = sorted(zip(candidates, scores), key=lambda x: x[1], reverse=True)
             candidates = [c for (c, s) in ranked]
         except Exception:
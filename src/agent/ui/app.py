@@ -9,14 +9,16 @@ if SRC_DIR not in sys.path:
 
 import io
 import importlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Dict, Any
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
 import streamlit as st
 from docx import Document
 
 from agent.config import CONFIG
 from agent.doc_processing.parser import (
+    extract_full_text,
     load_document_from_bytes,
     parse_document_structure,
     summarize_structure,
@@ -50,51 +52,64 @@ def _compute_missing(process: str, detected_types: List[str]) -> Tuple[List[str]
     return compare_uploaded_to_required(process, detected_types)
 
 
-def run_analysis(uploaded_files: List[Any], include_comments: bool, forced_process: str | None) -> Dict[str, Any]:
-    files_reports: List[FileReport] = []
-    packaged_files: List[Tuple[str, bytes]] = []
-    classifier = DocumentClassifier()
-    detected_types: List[str] = []
-    doc_text_map: Dict[str, str] = {}
+def process_file(name: str, data: bytes, classifier: DocumentClassifier, include_comments: bool) -> Tuple[FileReport, Tuple[str, bytes], str, Tuple[str, str]]:
+    doc = load_document_from_bytes(data)
 
-    for f in uploaded_files or []:
-        data = f.getvalue()
-        doc = load_document_from_bytes(data)
+    blocks = parse_document_structure(doc)
+    summary = summarize_structure(blocks)
 
-        blocks = parse_document_structure(doc)
-        summary = summarize_structure(blocks)
+    doc_type = classifier.classify(name, doc)
 
-        doc_type = classifier.classify(f.name, doc)
-        detected_types.append(doc_type)
+    # Keep a short excerpt for Q&A context
+    excerpt = extract_full_text(doc, max_chars=4000)
 
-        # Keep a short excerpt for Q&A context
-        excerpt = "\n".join(p.text for p in doc.paragraphs)[:4000]
-        doc_text_map[f.name] = excerpt
+    rag_issues = analyze_document(doc, name, doc_type)
 
-        rag_issues = analyze_document(doc, f.name, doc_type)
+    reviewed_doc = doc
+    if include_comments and rag_issues:
+        reviewed_doc = add_issue_comments(
+            document=doc,
+            issues=[i.model_dump() for i in rag_issues],
+            author=CONFIG.comment_author,
+            initials=CONFIG.comment_initials,
+        )
 
-        reviewed_doc = doc
-        if include_comments and rag_issues:
-            reviewed_doc = add_issue_comments(
-                document=doc,
-                issues=[i.model_dump() for i in rag_issues],
-                author=CONFIG.comment_author,
-                initials=CONFIG.comment_initials,
-            )
+    reviewed_buffer = io.BytesIO()
+    reviewed_doc.save(reviewed_buffer)
+    reviewed_bytes = reviewed_buffer.getvalue()
 
-        reviewed_buffer = io.BytesIO()
-        reviewed_doc.save(reviewed_buffer)
-        reviewed_bytes = reviewed_buffer.getvalue()
+    report = FileReport(
+        filename=name,
+        document_type=doc_type,
+        structure_summary=summary,
+        issues_found=rag_issues,
+    )
+    return report, (f"reviewed_{name}", reviewed_bytes), doc_type, (name, excerpt)
 
-        files_reports.append(
-            FileReport(
-                filename=f.name,
-                document_type=doc_type,
-                structure_summary=summary,
-                issues_found=rag_issues,
-            )
-        )
-        packaged_files.append((f"reviewed_{f.name}", reviewed_bytes))
+
+# Keyed on the uploaded bytes, so re-running on unchanged inputs is served from cache.
+# Gemini/RAG failures degrade to fewer issues rather than raising, so entries expire
+# instead of keeping a degraded result for the whole session.
+@st.cache_data(show_spinner=False, max_entries=16, ttl=600)
+def _run_analysis_cached(files_bytes: Tuple[Tuple[str, bytes], ...], include_comments: bool, forced_process: str | None) -> Dict[str, Any]:
+    files_reports: List[FileReport] = []
+    packaged_files: List[Tuple[str, bytes]] = []
+    classifier = DocumentClassifier()
+    detected_types: List[str] = []
+    doc_text_map: Dict[str, str] = {}
+
+    # Each upload is independent (parse, classify, Gemini/RAG, annotate, save), so
+    # files are processed concurrently; map() keeps upload order
+    results: List[Tuple[FileReport, Tuple[str, bytes], str, Tuple[str, str]]] = []
+    if files_bytes:
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(files_bytes)))) as ex:
+            results = list(ex.map(lambda item: process_file(item[0], item[1], classifier, include_comments), files_bytes))
+
+    for report, packaged, doc_type, (name, excerpt) in results:
+        files_reports.append(report)
+        packaged_files.append(packaged)
+        detected_types.append(doc_type)
+        doc_text_map[name] = excerpt
 
     auto_process = infer_process(detected_types)
     process = forced_process or auto_process
@@ -133,6 +148,11 @@ def run_analysis(uploaded_files: List[Any], include_comments: bool, forced_proce
     }
 
 
+def run_analysis(uploaded_files: List[Any], include_comments: bool, forced_process: str | None) -> Dict[str, Any]:
+    files_bytes = tuple((f.name, f.getvalue()) for f in uploaded_files or [])
+    return _run_analysis_cached(files_bytes, include_comments, forced_process)
+
+
 uploaded_files = st.file_uploader(
     "Upload .docx files",
     type=["docx"],
@@ -206,10 +226,11 @@ if run:
         )
     with col2:
         zip_buffer = io.BytesIO()
-        with ZipFile(zip_buffer, mode="w", compression=ZIP_DEFLATED) as zf:
+        with ZipFile(zip_buffer, mode="w", compression=ZIP_DEFLATED, compresslevel=1) as zf:
             zf.writestr("adgm_report.json", report_json)
+            # .docx files are already zip-compressed; store them as-is
             for fname, fb in packaged_files:
-                zf.writestr(fname, fb)
+                zf.writestr(fname, fb, compress_type=ZIP_STORED)
         st.download_button(
             label="Download All (ZIP)",
             data=zip_buffer.getvalue(),
@@ -252,7 +273,12 @@ with st.sidebar:
             try:
                 root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../"))
                 from agent.rag.ingest import ingest_sources as _ingest
+                from agent.rag.cache import clear_retrieval_cache
+                from agent.chat.semantic_cache import QA_SEMANTIC_CACHE
                 stats = _ingest(root)
+                clear_retrieval_cache()
+                QA_SEMANTIC_CACHE.clear()
+                _run_analysis_cached.clear()
                 st.success(f"Indexed chunks: {stats['chunks_indexed']}")
             except AssertionError as e:
                 st.error(str(e))